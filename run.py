@@ -95,14 +95,24 @@ def main():
                 print(f"      This is OK - server includes demo responses for safety questions")
     
     # Start server
+    # server.py reads PORT from the environment or the .env file
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        pass
+    port = os.environ.get('PORT', '5000')
+    
     print("\n" + "=" * 60)
     
     print("Starting Flask Server")
     print("=" * 60)
-    print("\nServer running on: http://localhost:5000")
+    print(f"\nServer running on: http://localhost:{port}")
     print("Press Ctrl+C to stop the server")
     print("=" * 60 + "\n")
     
+    # execvp keeps this PID, so SIGTERM/SIGINT go straight to server.py,
+    # which drains in-flight requests before exiting
     try:
         os.execvp(python_exe, [python_exe, 'server.py'])
     except KeyboardInterrupt:
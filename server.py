@@ -4,11 +4,19 @@ Handles AI integration and API endpoints
 """
 
 import os
+import hashlib
 import json
+import select
+import signal
+import sys
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Any
 from flask import Flask, request, jsonify
 from dotenv import load_dotenv
+from werkzeug.debug import DebuggedApplication
+from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler
 
 # Type hints for optional google generative AI
 genai: Optional[Any] = None
@@ -87,324 +95,146 @@ else:
 # Global chat session
 chat_session = None
 
-# Demo responses for oil and gas educational content
-DEMO_RESPONSES = {
-    "confined space": """Confined Space Safety refers to safety protocols for working in spaces that have limited entry/exit points.
-
-Key Aspects:
-- Identification: Tanks, vaults, trenches, vessels
-- Requirements: Testing, permits, atmospheric monitoring
-- Hazards: Oxygen depletion, toxic gases, engulfment
-- Procedures: Pre-entry inspection, ventilation, rescue equipment
-- Training: All personnel must be properly trained
-
-[DISCLAIMER] Educational information only. Consult certified safety professionals and follow your organization's procedures.""",
-
-    "ppe": """Personal Protective Equipment (PPE) protects workers from health and safety risks.
-
-Common PPE Items:
-- Head Protection: Hard hats, helmets
-- Eye Protection: Safety glasses, goggles, face shields
-- Respiratory Protection: Masks, respirators
-- Hand Protection: Gloves for chemicals/puncture
-- Foot Protection: Steel-toed boots
-- Body Protection: High-visibility clothing, chemical suits
-
-Proper fit, maintenance, and training are essential. This is educational information only.""",
-
-    "safety zone": """Safety Zones are designated areas with specific safety classifications.
-
-Zone Classification:
-- Safe Area: Normal operations, minimal hazards
-- Zone 0/1/2: Classified based on flammable atmosphere
-- Hazard Areas: Equipment maintenance, chemical storage
-
-Requirements:
-- Clearly marked signs and barriers
-- Restricted access with authorization
-- Equipment must match zone classification
-- Regular inspections and maintenance
-
-Consult your facility safety manual for specific definitions.""",
-
-    "emergency procedures": """Emergency procedures establish response protocols for incidents.
-
-Key Components:
-- Evacuation Routes: Marked exit paths and assembly points
-- Communication: Alert systems, chain of command
-- First Aid: Designated stations and trained personnel
-- Shutdown Procedures: Safe equipment shutdown
-- Incident Reporting: Documentation and investigation
-
-Response Steps:
-1. Alert and notify all personnel
-2. Evacuate to assembly points
-3. Account for all personnel
-4. Initiate incident response teams
-5. Prevent further hazards
-
-Participate in regular emergency drills and training.""",
-
-    "oil": """Oil (Petroleum) is a naturally occurring liquid hydrocarbon.
-
-Composition:
-- Hydrocarbons (hydrogen and carbon compounds)
-- Ranges from light to heavy crude
-- Contains various chemical compounds
-
-Uses of Oil:
-- Fuel: Gasoline, diesel, jet fuel, heating oil
-- Energy: Primary energy source for power generation
-- Chemicals: Feedstock for plastics, fertilizers, pharmaceuticals
-- Lubricants: Industrial and automotive uses
-- Bitumen: Roads and roofing
-
-Global Usage:
-- Transportation: ~25% of global consumption
-- Industrial: ~30% for chemicals and manufacturing
-- Power generation: ~10%
-- Residential/Commercial: ~15% for heating
-- Other: ~20% (plastics, textiles, medicines)
-
-Key Statistics:
-- Global daily consumption: ~100 million barrels per day
-- Major producers: USA, Saudi Arabia, Russia, Iraq
-- Major consumers: USA, China, India, Japan, Germany
-
-Educational information about global oil usage.""",
-
-    "gas": """Natural Gas (Methane) is a fossil fuel found in geological formations.
-
-Characteristics:
-- Colorless, odorless hydrocarbon gas
-- Less carbon-intensive than oil or coal
-- Cleaner burning energy source
-- Used for heating and electricity generation
-
-Uses:
-- Power Generation: ~30% - electricity production
-- Heating: ~25% - residential and commercial
-- Industrial: ~30% - chemical manufacturing
-- Transportation: ~5% - CNG vehicles
-- Feedstock: ~10% - chemical and fertilizer production
-
-Global Usage:
-- Major producers: USA, Russia, Iran, Qatar, China
-- Major consumers: USA, Russia, Japan, Germany, Canada
-- Daily consumption: ~4 billion cubic meters annually
-
-Advantages:
-- Lower carbon emissions than coal or oil
-- Abundant natural reserves
-- Efficient for heating and cooking
-- Reliable power generation
-
-Educational information about natural gas usage.""",
-
-    "energy": """Energy in oil and gas industry is conversion of hydrocarbons to power and heat.
-
-Energy Sources:
-- Crude Oil: Refined into gasoline, diesel, heating oil
-- Natural Gas: Heating, power generation, feedstock
-- Petroleum Products: Jet fuel, propane, butane, biofuels
-
-Energy Production:
-1. Exploration and drilling
-2. Production and extraction
-3. Transportation and storage
-4. Refining and processing
-5. Distribution to end users
-
-Types of Energy:
-- Thermal: Combustion for heat
-- Electrical: Power plant generation
-- Kinetic: Vehicle propulsion
-- Chemical: Manufacturing feedstock
-
-Global Energy Mix:
-- Oil: ~30% of global primary energy
-- Natural Gas: ~25%
-- Renewables: ~15% and growing
-- Coal: ~25%
-- Nuclear: ~5%
-
-Educational overview of energy from oil and gas.""",
-
-    "production": """Oil and Gas Production is extraction and processing of hydrocarbons.
-
-Production Phases:
-
-1. Upstream (Exploration & Extraction)
-   - Seismic surveys to locate reserves
-   - Drilling wells
-   - Pumping to surface
-   - Initial separation and handling
-
-2. Midstream (Transportation & Storage)
-   - Pipeline transport
-   - Storage facilities
-   - Terminal operations
-   - Custody transfer
-
-3. Downstream (Refining & Distribution)
-   - Crude oil refining
-   - Product distribution
-   - Retail sales
-   - End consumer delivery
-
-Production Methods:
-- Conventional: Onshore and offshore drilling
-- Unconventional: Shale oil, tar sands, tight gas
-- Heavy Oil: Special extraction techniques
-- Enhanced Recovery: Secondary/tertiary methods
-
-Safety in Production:
-- Blowout prevention
-- Pressure management
-- Environmental protection
-- Worker safety protocols
-- Emergency response systems
-
-Educational information about production processes.""",
-
-    "equipment": """Oil and Gas Equipment includes machinery used in extraction, processing, and transportation.
-
-Well Equipment:
-- Drilling rigs (offshore and onshore)
-- Pump jacks and sucker rods
-- Wellheads and Christmas trees
-- Blowout preventers (BOPs)
-- Casing and tubing
-
-Processing Equipment:
-- Separators (oil, gas, water separation)
-- Compressors for gas
-- Dehydrators for moisture removal
-- Heaters and coolers
-- Filtration systems
-
-Transportation Equipment:
-- Pipelines and pipe fittings
-- Storage tanks
-- Tanker trucks and rail cars
-- Barges and ships
-- Meters and gauges
-
-Maintenance:
-- Regular inspections required
-- Preventive maintenance schedules
-- Safety testing protocols
-- Replacement of worn components
-- Certification requirements
-
-Educational overview of equipment types.""",
-
-    "refining": """Oil Refining converts crude oil into usable petroleum products.
-
-Refining Process:
-1. Distillation: Separates crude by boiling point
-2. Cracking: Breaks large molecules into smaller ones
-3. Reforming: Rearranges molecular structure
-4. Treating: Removes impurities and sulfur
-5. Blending: Combines components for specifications
-
-Main Products:
-- Gasoline (petrol)
-- Diesel fuel
-- Jet fuel (kerosene)
-- Heating oil
-- Liquefied Petroleum Gas (LPG)
-- Bitumen for roads
-- Feedstock for chemicals
-
-Refinery Operations:
-- Crude oil storage tanks
-- Furnaces and heaters
-- Distillation columns
-- Process control systems
-- Safety and environmental controls
-
-Yield and Efficiency:
-- Typical barrel produces multiple products
-- Light crude yields more gasoline
-- Heavy crude requires more processing
-- Optimization for market demand
-- Energy efficiency improvements
-
-Educational information about refining processes.""",
-
-    "safety": """Oil and Gas Safety encompasses comprehensive protocols to protect workers, equipment, and environment.
-
-Key Safety Areas:
-- Personal Safety: PPE, training, certifications
-- Process Safety: Equipment design, maintenance, procedures
-- Emergency Response: Fire, explosion, spill management
-- Environmental Protection: Containment, cleanup
-- Health & Hygiene: Medical screening, sanitation
-
-Regulatory Requirements:
-- OSHA standards (Occupational Safety & Health)
-- EPA regulations (Environmental)
-- API standards (American Petroleum Institute)
-- Industry best practices
-- Local regulations
-
-Safety Management Systems:
-- Hazard identification and assessment
-- Risk reduction measures
-- Incident investigation
-- Safety training and drills
-- Continuous improvement programs
-
-Critical Safety Topics:
-- Confined space entry
-- Hot work and fire prevention
-- Electrical safety
-- Pressure equipment safety
-- Fall protection
-- Chemical handling
-
-Educational safety information. Follow your organization's procedures and consult certified professionals."""
-}
+# Topic catalog for demo responses, loaded from an external JSON file so
+# topics and synonyms can be edited without a code change or restart
+TOPICS_FILE = os.environ.get(
+    'TOPICS_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'topics.json')
+)
+TOPICS_RELOAD_INTERVAL = float(os.environ.get('TOPICS_RELOAD_INTERVAL', '2'))
+
+# Live catalog snapshot. Never mutated in place: reloads build a new dict and
+# swap the reference, so request threads always see a consistent catalog.
+topic_catalog = {'responses': {}, 'smart_matches': {}, 'signature': None}
+topic_catalog_lock = threading.Lock()
+TOPICS_MISSING = 'missing'
+
+def _validate_catalog(responses: Any, smart_matches: Any):
+    """Raise ValueError unless the catalog is safe to serve"""
+    for name, section in (('responses', responses), ('smart_matches', smart_matches)):
+        if not isinstance(section, dict):
+            raise ValueError(f"'{name}' must be an object")
+        for key, value in section.items():
+            # Queries are lowercased before matching, and an empty key would
+            # match every query
+            if not key.strip():
+                raise ValueError(f"'{name}' has an empty key")
+            if key != key.lower():
+                raise ValueError(f"'{name}' key '{key}' must be lowercase")
+            if not isinstance(value, str):
+                raise ValueError(f"'{name}' entry '{key}' must be a string")
+    for term, keyword in smart_matches.items():
+        if keyword not in responses:
+            raise ValueError(f"synonym '{term}' points to unknown topic '{keyword}'")
+
+def _same_section(old: dict, new: dict) -> bool:
+    """Compare sections including key order, since matching is first-match"""
+    return list(old.items()) == list(new.items())
+
+def load_topic_catalog(force: bool = False) -> bool:
+    """Reload topics.json if its content changed; return True if a swap happened"""
+    global topic_catalog
+    try:
+        with open(TOPICS_FILE, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        # Warn once, then stay quiet until the file comes back
+        with topic_catalog_lock:
+            if topic_catalog['signature'] == TOPICS_MISSING:
+                return False
+            topic_catalog = dict(topic_catalog, signature=TOPICS_MISSING)
+        print(f"Warning: Topic catalog not readable ({e})")
+        return False
+
+    # Hash the content rather than trusting mtime/size, which can miss a
+    # same-size save on filesystems with coarse timestamps
+    signature = hashlib.sha256(raw).hexdigest()
+    if not force and signature == topic_catalog['signature']:
+        return False
+
+    with topic_catalog_lock:
+        current = topic_catalog
+        if not force and signature == current['signature']:
+            return False
+        try:
+            data = json.loads(raw.decode('utf-8'))
+            if not isinstance(data, dict):
+                raise ValueError("top level must be an object")
+            responses = data.get('responses', {})
+            smart_matches = data.get('smart_matches', {})
+            _validate_catalog(responses, smart_matches)
+        except Exception as e:
+            # Keep serving the previous catalog if the new file is broken
+            print(f"Warning: Could not load topic catalog: {e}")
+            topic_catalog = dict(current, signature=signature)
+            return False
+
+        if (_same_section(current['responses'], responses)
+                and _same_section(current['smart_matches'], smart_matches)):
+            topic_catalog = dict(current, signature=signature)
+            return False
+
+        topic_catalog = {
+            'responses': responses,
+            'smart_matches': smart_matches,
+            'signature': signature
+        }
+    print(f"Topic catalog loaded: {len(responses)} topics, {len(smart_matches)} synonyms")
+    return True
+
+def watch_topic_catalog():
+    """Poll the topic catalog file and apply changes in the background"""
+    while True:
+        time.sleep(TOPICS_RELOAD_INTERVAL)
+        try:
+            load_topic_catalog()
+        except Exception as e:
+            print(f"Warning: Topic catalog watcher error: {e}")
+
+# Watcher thread and the process that started it; threads don't survive a
+# fork, so a forked WSGI worker starts its own
+topic_watcher = None
+topic_watcher_pid = None
+
+def start_topic_watcher():
+    """Start the background catalog watcher thread once per process"""
+    global topic_watcher, topic_watcher_pid
+    if TOPICS_RELOAD_INTERVAL <= 0:
+        return None
+    if topic_watcher_pid == os.getpid():
+        return topic_watcher
+    with topic_catalog_lock:
+        if topic_watcher_pid != os.getpid():
+            topic_watcher = threading.Thread(target=watch_topic_catalog,
+                                             name='topic-watcher', daemon=True)
+            topic_watcher.start()
+            topic_watcher_pid = os.getpid()
+    return topic_watcher
+
+load_topic_catalog(force=True)
+start_topic_watcher()
+
+@app.before_request
+def ensure_topic_watcher():
+    # Covers WSGI servers that import this module and then fork workers
+    start_topic_watcher()
 
 def get_demo_response(query: str) -> str:
     """Get demo response based on query keywords"""
     query_lower = query.lower().strip()
+    # Take one snapshot so a concurrent reload can't mix old and new entries
+    catalog = topic_catalog
+    responses = catalog['responses']
     
     # Direct keyword matching
-    for keyword, response in DEMO_RESPONSES.items():
+    for keyword, response in responses.items():
         if keyword in query_lower:
             return response
     
     # Smart variations matching
-    smart_matches = {
-        "oil across": "oil",
-        "global oil": "oil",
-        "use of oil": "oil",
-        "usage of oil": "oil",
-        "natural gas": "gas",
-        "methane": "gas",
-        "lpg": "gas",
-        "propane": "gas",
-        "power generation": "energy",
-        "electricity": "energy",
-        "fuel": "energy",
-        "drilling": "production",
-        "well": "production",
-        "extraction": "production",
-        "rig": "equipment",
-        "pump": "equipment",
-        "compressor": "equipment",
-        "tank": "equipment",
-        "refine": "refining",
-        "gasoline": "refining",
-        "diesel": "refining",
-        "crude": "refining"
-    }
-    
-    for term, keyword in smart_matches.items():
+    for term, keyword in catalog['smart_matches'].items():
         if term in query_lower:
-            return DEMO_RESPONSES.get(keyword, get_default_response(query))
+            return responses.get(keyword, get_default_response(query))
     
     return get_default_response(query)
 
@@ -563,13 +393,145 @@ def not_found(error):
 def server_error(error):
     return jsonify({'status': 'error', 'message': 'Server error'}), 500
 
+# Graceful shutdown: count every accepted connection (not just requests that
+# reached Flask) so SIGTERM can stop accepting and drain them before exiting
+SHUTDOWN_TIMEOUT = float(os.environ.get('SHUTDOWN_TIMEOUT', '30'))
+# How long to keep handing off connections queued before the socket closes
+SHUTDOWN_HANDOFF = 0.1
+PORT = int(os.environ.get('PORT', '5000'))
+# Debugger stays on as with app.run(debug=True); FLASK_DEBUG=0 turns it off
+DEBUG = os.environ.get('FLASK_DEBUG', '1').lower() not in ('0', 'false', 'no')
+inflight_requests = 0
+inflight_condition = threading.Condition()
+
+def _connection_opened():
+    """Mark one accepted connection as in flight"""
+    global inflight_requests
+    with inflight_condition:
+        inflight_requests += 1
+
+def _connection_closed():
+    """Mark one accepted connection as done"""
+    global inflight_requests
+    with inflight_condition:
+        inflight_requests -= 1
+        inflight_condition.notify_all()
+
+class DrainingRequestHandler(WSGIRequestHandler):
+    """Request handler that drops idle keep-alive connections on shutdown"""
+
+    def handle(self):
+        self.requests_handled = 0
+        super().handle()
+
+    def handle_one_request(self):
+        # Later requests on a keep-alive connection may never come; wait for
+        # data but give up once shutdown starts so idle clients don't stall it
+        if self.requests_handled:
+            while not select.select([self.connection], [], [], 0.2)[0]:
+                if self.server.stopping.is_set():
+                    self.close_connection = True
+                    return
+        super().handle_one_request()
+        self.requests_handled += 1
+        if self.server.stopping.is_set():
+            self.close_connection = True
+
+class DrainingWSGIServer(ThreadedWSGIServer):
+    """Threaded server that tracks connections from accept until close"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stopping = threading.Event()
+        self.shutdown_deadline = None
+
+    def begin_shutdown(self):
+        """Stop serving; the drain must finish within SHUTDOWN_TIMEOUT from now"""
+        self.shutdown_deadline = time.monotonic() + SHUTDOWN_TIMEOUT
+        self.stopping.set()
+        # shutdown() waits for serve_forever(), so it can't run on this thread
+        threading.Thread(target=self.shutdown, daemon=True).start()
+
+    def time_left(self) -> float:
+        """Seconds remaining before the shutdown deadline"""
+        return max(0.0, self.shutdown_deadline - time.monotonic())
+
+    def process_request(self, request, client_address):
+        _connection_opened()
+        try:
+            super().process_request(request, client_address)
+        except BaseException:
+            _connection_closed()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            _connection_closed()
+
+    def server_close(self):
+        # Hand off connections the kernel already queued before closing, but
+        # only for a short window so ongoing traffic can't keep the socket open
+        if self.stopping.is_set() and self.socket.fileno() != -1:
+            self.timeout = 0
+            handoff_end = time.monotonic() + min(SHUTDOWN_HANDOFF, self.time_left())
+            while (time.monotonic() < handoff_end
+                   and select.select([self.socket], [], [], 0)[0]):
+                self.handle_request()
+        super().server_close()
+
+def wait_for_inflight(timeout: float) -> bool:
+    """Block until no connections are in flight; return False on timeout"""
+    with inflight_condition:
+        return inflight_condition.wait_for(lambda: inflight_requests == 0, timeout)
+
+def serve(host: str = '0.0.0.0', port: int = PORT, debug: bool = DEBUG):
+    """Run the server until SIGTERM/SIGINT, then drain in-flight requests"""
+    wsgi_app = app
+    if debug:
+        # Same interactive debugger app.run(debug=True) would install
+        app.debug = True
+        wsgi_app = DebuggedApplication(app, evalex=True)
+    server = DrainingWSGIServer(host, port, wsgi_app, handler=DrainingRequestHandler)
+
+    def handle_signal(signum, frame):
+        if server.stopping.is_set():
+            print("\nForced shutdown")
+            sys.exit(1)
+        print(f"\nReceived {signal.Signals(signum).name}, shutting down...")
+        server.begin_shutdown()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    try:
+        # Short poll interval so the accept loop stops soon after a signal
+        server.serve_forever(poll_interval=0.1)
+    finally:
+        # Close the listening socket so no new connections are accepted
+        server.server_close()
+
+    if inflight_requests:
+        print(f"Waiting up to {server.time_left():.1f}s for {inflight_requests} in-flight request(s)...")
+    if wait_for_inflight(server.time_left()):
+        print("All requests completed")
+    else:
+        print(f"Warning: {inflight_requests} request(s) still running after {SHUTDOWN_TIMEOUT:g}s")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    print("Server stopped.")
+
 if __name__ == '__main__':
     print("=" * 60)
     print("Oil & Gas Plant Safety Bot - Backend Server")
     print("=" * 60)
     print(f"API Key: {bool(API_KEY)}")
-    print(f"Mode: Demo with 11 comprehensive topics")
-    print(f"URL: http://localhost:5000")
+    print(f"Mode: Demo with {len(topic_catalog['responses'])} comprehensive topics")
+    print(f"URL: http://localhost:{PORT}")
+    print(f"Topics: {TOPICS_FILE}")
+    print(f"Shutdown timeout: {SHUTDOWN_TIMEOUT:g}s")
+    print(f"Debugger: {'on (set FLASK_DEBUG=0 to disable)' if DEBUG else 'off'}")
     print("=" * 60)
     
-    app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
+    serve(host='0.0.0.0', port=PORT)
@@ -0,0 +1,112 @@
+"""
+Graceful shutdown test: SIGTERM during load must not drop any request
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@unittest.skipIf(sys.platform == 'win32', 'SIGTERM delivery needs POSIX')
+class GracefulShutdownTest(unittest.TestCase):
+
+    def setUp(self):
+        self.port = free_port()
+        env = dict(os.environ, PORT=str(self.port), SHUTDOWN_TIMEOUT='10',
+                   TOPICS_RELOAD_INTERVAL='0', GENAI_API_KEY='')
+        self.proc = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, 'server.py')],
+            cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+        self.addCleanup(self._stop)
+        deadline = time.time() + 15
+        while time.time() < deadline:
+            try:
+                with socket.create_connection(('127.0.0.1', self.port), timeout=1):
+                    return
+            except OSError:
+                time.sleep(0.1)
+        self.fail('server did not start')
+
+    def _stop(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.communicate()
+
+    def open_chat(self):
+        """Connect a client that will send a normal /api/chat request"""
+        conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=10)
+        conn.connect()
+        return conn
+
+    def chat(self, conn, results):
+        """Send one /api/chat request and record its status"""
+        try:
+            conn.request('POST', '/api/chat', json.dumps({'query': 'ppe'}),
+                         {'Content-Type': 'application/json'})
+            results.append(conn.getresponse().status)
+        except Exception as e:
+            results.append(repr(e))
+        finally:
+            conn.close()
+
+    def open_slow_client(self):
+        """Connect and send only the headers of a /api/chat request"""
+        body = json.dumps({'query': 'confined space'}).encode()
+        sock = socket.create_connection(('127.0.0.1', self.port), timeout=10)
+        sock.sendall(b'POST /api/chat HTTP/1.1\r\nHost: localhost\r\n'
+                     b'Content-Type: application/json\r\n'
+                     b'Content-Length: ' + str(len(body)).encode() + b'\r\n\r\n')
+        return sock, body
+
+    def finish_slow_client(self, sock, body, results):
+        """Send the rest of a slow request and record its status"""
+        try:
+            with sock:
+                sock.sendall(body)
+                reply = sock.makefile('rb').readline()
+            results.append(int(reply.split()[1]) if reply else repr(reply))
+        except Exception as e:
+            results.append(repr(e))
+
+    def test_sigterm_drains_inflight_requests(self):
+        results = []
+        slow_clients = [self.open_slow_client() for _ in range(5)]
+        burst = [threading.Thread(target=self.chat, args=(self.open_chat(), results))
+                 for _ in range(20)]
+        for t in burst:
+            t.start()
+
+        self.proc.send_signal(signal.SIGTERM)
+        time.sleep(0.5)
+        finishers = [threading.Thread(target=self.finish_slow_client, args=(sock, body, results))
+                     for sock, body in slow_clients]
+        for t in finishers:
+            t.start()
+        for t in burst + finishers:
+            t.join()
+
+        output, _ = self.proc.communicate(timeout=15)
+        self.assertEqual(results, [200] * 25, output)
+        self.assertEqual(self.proc.returncode, 0, output)
+        self.assertIn('All requests completed', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Topic catalog test: reloads, validation and fallback to the last good catalog
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ['TOPICS_RELOAD_INTERVAL'] = '0'
+
+import server  # noqa: E402
+
+
+class TopicCatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+        # Cleanups run last-in first-out: restore the path, then reload
+        self.addCleanup(server.load_topic_catalog, True)
+        self.addCleanup(setattr, server, 'TOPICS_FILE', server.TOPICS_FILE)
+        server.TOPICS_FILE = self.path
+
+        self.write({
+            'responses': {'gas': 'Gas answer', 'oil': 'Oil answer'},
+            'smart_matches': {'methane': 'gas'}
+        })
+        self.assertTrue(server.load_topic_catalog(force=True))
+
+    def write(self, data):
+        """Replace the catalog file with the given JSON data"""
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(data if isinstance(data, str) else json.dumps(data))
+
+    def test_edit_is_picked_up(self):
+        self.write({
+            'responses': {'gas': 'Gas answer', 'oil': 'Oil answer', 'h2s': 'H2S answer'},
+            'smart_matches': {'methane': 'gas', 'hydrogen sulfide': 'h2s'}
+        })
+        self.assertTrue(server.load_topic_catalog())
+        self.assertEqual(server.get_demo_response('What is hydrogen sulfide?'), 'H2S answer')
+        self.assertFalse(server.load_topic_catalog())
+
+    def test_same_size_edit_is_picked_up(self):
+        stat = os.stat(self.path)
+        self.write({
+            'responses': {'gas': 'Gas ANSWER', 'oil': 'Oil answer'},
+            'smart_matches': {'methane': 'gas'}
+        })
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(os.stat(self.path).st_size, stat.st_size)
+        self.assertTrue(server.load_topic_catalog())
+        self.assertEqual(server.get_demo_response('methane'), 'Gas ANSWER')
+
+    def test_invalid_files_keep_previous_catalog(self):
+        invalid = [
+            '{broken',
+            {'responses': {'gas': ['not', 'a', 'string']}, 'smart_matches': {}},
+            {'responses': {'gas': 'Gas answer'}, 'smart_matches': {'methane': 'nope'}},
+            {'responses': {'H2S': 'H2S answer'}, 'smart_matches': {}},
+            {'responses': {'gas': 'Gas answer'}, 'smart_matches': {'Methane': 'gas'}},
+            {'responses': {' ': 'Catch-all'}, 'smart_matches': {}},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                self.write(data)
+                self.assertFalse(server.load_topic_catalog())
+                self.assertEqual(server.get_demo_response('methane'), 'Gas answer')
+                self.assertIn('Thank you for asking', server.get_demo_response('hello'))
+
+    def test_missing_file_keeps_previous_catalog(self):
+        os.remove(self.path)
+        self.assertFalse(server.load_topic_catalog())
+        self.assertEqual(server.get_demo_response('oil'), 'Oil answer')
+        self.write({'responses': {'oil': 'New oil answer'}, 'smart_matches': {}})
+        self.assertTrue(server.load_topic_catalog())
+        self.assertEqual(server.get_demo_response('oil'), 'New oil answer')
+
+    def test_key_order_decides_first_match(self):
+        self.assertEqual(server.get_demo_response('oil and gas'), 'Gas answer')
+        self.write({
+            'responses': {'oil': 'Oil answer', 'gas': 'Gas answer'},
+            'smart_matches': {'methane': 'gas'}
+        })
+        self.assertTrue(server.load_topic_catalog())
+        self.assertEqual(server.get_demo_response('oil and gas'), 'Oil answer')
+
+
+if __name__ == '__main__':
+    unittest.main()